@@ -0,0 +1,59 @@
+"""Bril text/json conversion and profile helpers shared by the lesson report scripts."""
+
+from pathlib import Path
+import subprocess
+import contextlib
+import json
+import io
+
+try:
+    # bril2json and bril2txt are thin entry points around briltxt, so calling it
+    # directly saves spawning two interpreters per file
+    import briltxt
+except ImportError:
+    briltxt = None
+
+
+def bril2json(program: str) -> str:
+    """convert a textual bril program into its json representation"""
+    if briltxt is None:
+        return subprocess.run(
+            ["bril2json"], input=program, capture_output=True, text=True, check=True
+        ).stdout
+    return briltxt.parse_bril(program)
+
+
+class LineCounter(io.TextIOBase):
+    """text sink that only keeps a count of the newlines written to it"""
+
+    def __init__(self):
+        self.lines = 0
+
+    def write(self, s: str) -> int:
+        self.lines += s.count("\n")
+        return len(s)
+
+
+def bril2txt_line_count(program: str) -> int:
+    """count the lines of the textual representation of a json bril program"""
+    if briltxt is None:
+        with subprocess.Popen(
+            ["bril2txt"], stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        ) as proc:
+            proc.stdin.write(program.encode("utf-8"))
+            proc.stdin.close()
+            lines = 0
+            for chunk in iter(lambda: proc.stdout.read(65536), b""):
+                lines += chunk.count(b"\n")
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, proc.args)
+        return lines
+    counter = LineCounter()
+    with contextlib.redirect_stdout(counter):
+        briltxt.print_prog(json.loads(program))
+    return counter.lines
+
+
+def read_dyn_inst(prof_file: Path) -> int:
+    """read the count from a turnt profile sidecar, e.g. `total_dyn_inst: 1234`"""
+    return int(prof_file.read_text(encoding="utf-8").rsplit(" ", 1)[-1])
@@ -2,58 +2,60 @@
 
 from pathlib import Path
 import subprocess
+import multiprocessing
 import json
 
-BENCHMARKS_DIR = Path("benchmarks")
-subprocess.run(["cargo", "build", "--release"], check=True)
+from tqdm import tqdm
 
+from bril_tools import bril2json, bril2txt_line_count, read_dyn_inst
 
-def transform_file(f: Path) -> tuple[str, str]:
-    """returns [original_condensed_program, compiler_condensed_program]"""
-    print(f"getting condensed files for {file.as_posix()}")
-    with open(f, "r", encoding="utf-8") as infile:
+BENCHMARKS_DIR = Path("benchmarks")
 
-        def bril2json(infile) -> str:
-            return subprocess.run(
-                ["bril2json"], stdin=infile, capture_output=True, text=True, check=True
-            )
 
-        def bril2txt(stdout) -> str:
-            return subprocess.run(
-                ["bril2txt"], input=stdout, capture_output=True, text=True, check=True
-            )
+def transform_file(f: Path) -> tuple[Path, int, int, int, int]:
+    """returns [file, original_condensed_lines, compiler_condensed_lines, baseline_prof, prof]"""
+    with open(f, "r", encoding="utf-8") as infile:
+        source = infile.read()
+
+    def rust_bril(f) -> str:
+        return subprocess.run(
+            ["./target/release/rust_bril", "-f", f, "--local"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
 
-        def rust_bril(f) -> str:
-            return subprocess.run(
-                ["./target/release/rust_bril", "-f", f, "--local"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
+    original_lines = bril2txt_line_count(bril2json(source))
+    compiled_lines = bril2txt_line_count(rust_bril(f.as_posix()).stdout)
 
-        return (
-            bril2txt(bril2json(infile).stdout).stdout,
-            bril2txt(rust_bril(file.as_posix()).stdout).stdout,
-        )
+    baseline_prof = read_dyn_inst(f.with_suffix(".baseline_prof"))
+    prof = read_dyn_inst(f.with_suffix(".prof"))
 
+    return f, original_lines, compiled_lines, baseline_prof, prof
 
-# transform each file into json and back using bril2json and bril2txt
-benchmarks = {}
 
-for file in BENCHMARKS_DIR.glob("**/*.bril"):
-    original, compiled = transform_file(file)
+if __name__ == "__main__":
+    subprocess.run(["cargo", "build", "--release"], check=True)
 
-    with open(file.with_suffix(".baseline_prof"), "r", encoding="utf-8") as infile:
-        baseline_prof = int(infile.read().split(" ")[-1])
+    # transform each file into json and back using bril2json and bril2txt
+    benchmarks = {}
+    bril_files = list(BENCHMARKS_DIR.glob("**/*.bril"))
 
-    with open(file.with_suffix(".prof"), "r", encoding="utf-8") as infile:
-        prof = int(infile.read().split(" ")[-1])
+    with multiprocessing.Pool() as pool:
+        results = list(
+            tqdm(
+                pool.imap(transform_file, bril_files),
+                total=len(bril_files),
+                desc="Condensing files",
+            )
+        )
 
-    benchmarks[file.name] = {
-        "original_lines": original.count("\n"),
-        "original_dyn_inst": baseline_prof,
-        "compiled_lines": compiled.count("\n"),
-        "compiled_dyn_inst": prof,
-    }
+    for file, original_lines, compiled_lines, baseline_prof, prof in results:
+        benchmarks[file.name] = {
+            "original_lines": original_lines,
+            "original_dyn_inst": baseline_prof,
+            "compiled_lines": compiled_lines,
+            "compiled_dyn_inst": prof,
+        }
 
-json.dump(benchmarks, open("lesson3_benchmarks.json", "w", encoding="utf-8"), indent=4)
+    json.dump(benchmarks, open("lesson3_benchmarks.json", "w", encoding="utf-8"), indent=4)
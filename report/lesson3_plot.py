@@ -1,49 +1,51 @@
-import json
+from pathlib import Path
+
+import orjson
 import numpy as np
+import matplotlib
+
+# render straight to a file; an interactive backend is much slower and needs a display
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
-with open("./report/lesson3_benchmarks.json", "r", encoding="utf-8") as infile:
-    data = json.load(infile)
+data = orjson.loads(Path("./report/lesson3_benchmarks.json").read_bytes())
 
 programs = list(data.keys())
-original_lines = [data[p]["original_lines"] for p in programs]
-compiled_lines = [data[p]["compiled_lines"] for p in programs]
-original_dyn = [data[p]["original_dyn_inst"] for p in programs]
-compiled_dyn = [data[p]["compiled_dyn_inst"] for p in programs]
+original_lines = np.array([data[p]["original_lines"] for p in programs])
+compiled_lines = np.array([data[p]["compiled_lines"] for p in programs])
+original_dyn = np.array([data[p]["original_dyn_inst"] for p in programs])
+compiled_dyn = np.array([data[p]["compiled_dyn_inst"] for p in programs])
 
 # --- Statistics ---
-reductions_static = {}
-reductions_dynamic = {}
-
-for prog, stats in data.items():
-    if stats["original_lines"] > 0:
-        reductions_static[prog] = (
-            (stats["original_lines"] - stats["compiled_lines"])
-            / stats["original_lines"]
-            * 100
-        )
-    if stats["original_dyn_inst"] > 0:
-        reductions_dynamic[prog] = (
-            (stats["original_dyn_inst"] - stats["compiled_dyn_inst"])
-            / stats["original_dyn_inst"]
-            * 100
-        )
+static_mask = original_lines > 0
+dynamic_mask = original_dyn > 0
+
+# programs with an empty original are excluded from the averages and never the greatest
+with np.errstate(divide="ignore", invalid="ignore"):
+    reductions_static = np.where(
+        static_mask, (original_lines - compiled_lines) / original_lines * 100, -np.inf
+    )
+    reductions_dynamic = np.where(
+        dynamic_mask, (original_dyn - compiled_dyn) / original_dyn * 100, -np.inf
+    )
 
 # Average reductions
-avg_static_reduction = sum(reductions_static.values()) / len(reductions_static)
-avg_dynamic_reduction = sum(reductions_dynamic.values()) / len(reductions_dynamic)
+avg_static_reduction = reductions_static[static_mask].mean()
+avg_dynamic_reduction = reductions_dynamic[dynamic_mask].mean()
 
 # Greatest reductions
-greatest_static = max(reductions_static, key=reductions_static.get)
-greatest_dynamic = max(reductions_dynamic, key=reductions_dynamic.get)
+greatest_static_idx = int(reductions_static.argmax())
+greatest_dynamic_idx = int(reductions_dynamic.argmax())
+greatest_static = programs[greatest_static_idx]
+greatest_dynamic = programs[greatest_dynamic_idx]
 
 print(f"Average Static Reduction: {avg_static_reduction:.2f}%")
 print(f"Average Dynamic Reduction: {avg_dynamic_reduction:.2f}%")
 print(
-    f"Greatest Static Reduction: {greatest_static} ({reductions_static[greatest_static]:.2f}%)"
+    f"Greatest Static Reduction: {greatest_static} ({reductions_static[greatest_static_idx]:.2f}%)"
 )
 print(
-    f"Greatest Dynamic Reduction: {greatest_dynamic} ({reductions_dynamic[greatest_dynamic]:.2f}%)"
+    f"Greatest Dynamic Reduction: {greatest_dynamic} ({reductions_dynamic[greatest_dynamic_idx]:.2f}%)"
 )
 
 
@@ -85,4 +87,5 @@ axes[1].set_yscale("log")
 axes[1].legend()
 
 plt.tight_layout()
-plt.show()
+fig.savefig("./report/lesson3.png", dpi=120)
+print("Wrote ./report/lesson3.png")
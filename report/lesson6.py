@@ -1,89 +1,92 @@
 from pathlib import Path
 import subprocess
+import multiprocessing
 import json
 
-BENCHMARKS_DIR = Path("benchmarks")
-subprocess.run(["cargo", "build", "--release"], check=True)
-
+from tqdm import tqdm
 
-def transform_file(f: Path) -> tuple[str, str, str, str]:
-    """returns [original_condensed_program, dce]"""
-    print(f"getting condensed files for {file.as_posix()}")
-    with open(f, "r", encoding="utf-8") as infile:
-
-        def bril2json(infile) -> subprocess.CompletedProcess[str]:
-            return subprocess.run(
-                ["bril2json"], stdin=infile, capture_output=True, text=True, check=True
-            )
+from bril_tools import bril2json, bril2txt_line_count, read_dyn_inst
 
-        def bril2txt(stdout) -> subprocess.CompletedProcess[str]:
-            return subprocess.run(
-                ["bril2txt"], input=stdout, capture_output=True, text=True, check=True
-            )
+BENCHMARKS_DIR = Path("benchmarks")
 
-        def rust_bril(f) -> subprocess.CompletedProcess[str]:
-            return subprocess.run(
-                ["./target/release/rust_bril", f],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
 
-        def rust_bril_dce(f) -> subprocess.CompletedProcess[str]:
-            return subprocess.run(
-                ["./target/release/rust_bril", f, "--dce"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
+def transform_file(f: Path) -> tuple[Path, int, int, int, int, int, int, int, int]:
+    """returns [file, line counts of original, ssa, ssa_dce, ssa_lvn_dce, and their dyn inst counts]"""
+    with open(f, "r", encoding="utf-8") as infile:
+        source = infile.read()
+
+    def rust_bril(f) -> subprocess.CompletedProcess[str]:
+        return subprocess.run(
+            ["./target/release/rust_bril", f, "--emit-passes=ssa,ssa_dce,ssa_lvn_dce"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
 
-        def rust_bril_lvn_dce(f) -> subprocess.CompletedProcess[str]:
-            return subprocess.run(
-                ["./target/release/rust_bril", f, "--lvn", "--dce"],
-                capture_output=True,
-                text=True,
-                check=True,
+    original_lines = bril2txt_line_count(bril2json(source))
+    # rust_bril emits one program per pipeline, separated by an ASCII record separator
+    ssa_lines, ssa_dce_lines, ssa_lvn_dce_lines = (
+        bril2txt_line_count(program) for program in rust_bril(f.as_posix()).stdout.split("\x1e")
+    )
+
+    baseline_prof = read_dyn_inst(f.with_suffix(".baseline_prof"))
+    ssa_prof = read_dyn_inst(f.with_suffix(".ssa_prof"))
+    ssa_dce_prof = read_dyn_inst(f.with_suffix(".ssa_dce_prof"))
+    ssa_lvn_dce_prof = read_dyn_inst(f.with_suffix(".ssa_lvn_dce_prof"))
+
+    return (
+        f,
+        original_lines,
+        ssa_lines,
+        ssa_dce_lines,
+        ssa_lvn_dce_lines,
+        baseline_prof,
+        ssa_prof,
+        ssa_dce_prof,
+        ssa_lvn_dce_prof,
+    )
+
+
+if __name__ == "__main__":
+    subprocess.run(["cargo", "build", "--release"], check=True)
+
+    # transform each file into json and back using bril2json and bril2txt
+    benchmarks = {}
+    bril_files = list(BENCHMARKS_DIR.glob("**/*.bril"))
+
+    with multiprocessing.Pool() as pool:
+        results = list(
+            tqdm(
+                pool.imap(transform_file, bril_files),
+                total=len(bril_files),
+                desc="Condensing files",
             )
-
-        return (
-            bril2txt(bril2json(infile).stdout).stdout,
-            bril2txt(rust_bril(file.as_posix()).stdout).stdout,
-            bril2txt(rust_bril_dce(file.as_posix()).stdout).stdout,
-            bril2txt(rust_bril_lvn_dce(file.as_posix()).stdout).stdout,
         )
 
-
-# transform each file into json and back using bril2json and bril2txt
-benchmarks = {}
-
-for file in BENCHMARKS_DIR.glob("**/*.bril"):
-    original, ssa, ssa_dce, ssa_lvn_dce = transform_file(file)
-
-    with open(file.with_suffix(".baseline_prof"), "r", encoding="utf-8") as infile:
-        baseline_prof = int(infile.read().split(" ")[-1])
-
-    with open(file.with_suffix(".ssa_prof"), "r", encoding="utf-8") as infile:
-        ssa_prof = int(infile.read().split(" ")[-1])
-
-    with open(file.with_suffix(".ssa_dce_prof"), "r", encoding="utf-8") as infile:
-        ssa_dce_prof = int(infile.read().split(" ")[-1])
-
-    with open(file.with_suffix(".ssa_lvn_dce_prof"), "r", encoding="utf-8") as infile:
-        ssa_lvn_dce_prof = int(infile.read().split(" ")[-1])
-
-    benchmarks[file.name] = {
-        "original_lines": original.count("\n"),
-        "original_dyn_inst": baseline_prof,
-        "compiled_lines": ssa.count("\n"),
-        "compiled_dyn_inst": ssa_prof,
-        "dce_lines": ssa_dce.count("\n"),
-        "dce_dyn_inst": ssa_dce_prof,
-        "lvn_dce_lines": ssa_lvn_dce.count("\n"),
-        "lvn_dce_dyn_inst": ssa_lvn_dce_prof,
-    }
-
-json.dump(
-    benchmarks,
-    open("./report/lesson6_benchmarks.json", "w", encoding="utf-8"),
-    indent=4,
-)
+    for (
+        file,
+        original_lines,
+        ssa_lines,
+        ssa_dce_lines,
+        ssa_lvn_dce_lines,
+        baseline_prof,
+        ssa_prof,
+        ssa_dce_prof,
+        ssa_lvn_dce_prof,
+    ) in results:
+        benchmarks[file.name] = {
+            "original_lines": original_lines,
+            "original_dyn_inst": baseline_prof,
+            "compiled_lines": ssa_lines,
+            "compiled_dyn_inst": ssa_prof,
+            "dce_lines": ssa_dce_lines,
+            "dce_dyn_inst": ssa_dce_prof,
+            "lvn_dce_lines": ssa_lvn_dce_lines,
+            "lvn_dce_dyn_inst": ssa_lvn_dce_prof,
+        }
+
+    json.dump(
+        benchmarks,
+        open("./report/lesson6_benchmarks.json", "w", encoding="utf-8"),
+        indent=4,
+    )
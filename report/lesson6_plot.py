@@ -1,21 +1,28 @@
-import json
+from pathlib import Path
+
+import orjson
 import numpy as np
+import pandas as pd
+import matplotlib
+
+# render straight to a file; an interactive backend is much slower and needs a display
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 
-with open("./report/lesson6_benchmarks.json", "r", encoding="utf-8") as infile:
-    data = json.load(infile)
+data = orjson.loads(Path("./report/lesson6_benchmarks.json").read_bytes())
 
-programs = list(data.keys())
+df = pd.DataFrame.from_dict(data, orient="index")
+programs = df.index.to_list()
 
-original_lines = np.array([data[p]["original_lines"] for p in programs])
-compiled_lines = np.array([data[p]["compiled_lines"] for p in programs])
-dce_lines = np.array([data[p]["dce_lines"] for p in programs])
-lvn_dce_lines = np.array([data[p]["lvn_dce_lines"] for p in programs])
+original_lines = df["original_lines"].to_numpy()
+compiled_lines = df["compiled_lines"].to_numpy()
+dce_lines = df["dce_lines"].to_numpy()
+lvn_dce_lines = df["lvn_dce_lines"].to_numpy()
 
-original_dyn = np.array([data[p]["original_dyn_inst"] for p in programs])
-compiled_dyn = np.array([data[p]["compiled_dyn_inst"] for p in programs])
-dce_dyn = np.array([data[p]["dce_dyn_inst"] for p in programs])
-lvn_dce_dyn = np.array([data[p]["lvn_dce_dyn_inst"] for p in programs])
+original_dyn = df["original_dyn_inst"].to_numpy()
+compiled_dyn = df["compiled_dyn_inst"].to_numpy()
+dce_dyn = df["dce_dyn_inst"].to_numpy()
+lvn_dce_dyn = df["lvn_dce_dyn_inst"].to_numpy()
 
 
 # # --- Statistics ---
@@ -97,4 +104,5 @@ axes[1].set_yscale("log")
 axes[1].legend()
 
 plt.tight_layout()
-plt.show()
+fig.savefig("./report/lesson6.png", dpi=120)
+print("Wrote ./report/lesson6.png")
@@ -1,14 +1,37 @@
+import os
 import time
-import json
+import asyncio
+import hashlib
+import tempfile
 import statistics
 import subprocess
 import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
+import orjson
+import psutil
+import numpy as np
 from tqdm import tqdm
 from pathlib import Path
 from dataclasses import dataclass
 
 BENCHMARKS_DIR = Path("benchmarks")
+RUST_BRIL = Path("./target/release/rust_bril")
+COMPILE_CACHE_DIR = Path("./report/.cache")
+
+# tmpfs keeps the per-configuration temp files in memory on Linux; elsewhere use the default temp dir
+TEMP_DIR = Path("/dev/shm") if Path("/dev/shm").is_dir() else None
+
+# Enhanced hyperfine options shared by every timing run
+_HYPERFINE_BASE = (
+    "hyperfine",
+    "--show-output",
+    "--warmup",
+    "10",  # 10 warmup runs to stabilize performance
+    "--min-runs",
+    "20",  # Minimum 20 runs even if variance is low
+    "--shell=none",  # Execute brilirs directly so no shell fork lands in the timings
+)
 
 compilation_flags = {
     "original": ["-s"],
@@ -27,51 +50,82 @@ class BrilBenchmarkInstance:
     compiled_flags: list[tuple[str, list[str]]]
 
 
-def generate_benchmark_instance(f: Path) -> BrilBenchmarkInstance:
+def generate_benchmark_instance(filename: str) -> BrilBenchmarkInstance:
     """Generate benchmark data for a single file"""
+    f = Path(filename)
 
-    # Extract arguments from the file
-    arg_extraction = subprocess.run(
-        [
-            "awk",
-            "/^# ARGS:/ {for (i=3; i<=NF; i++) print $i}",
-            f.as_posix(),
-        ],
-        capture_output=True,
-        text=True,
-        check=True,
-    )
+    source = f.read_bytes()
+    source_digest = hashlib.sha256(source).hexdigest()
+
+    # Extract arguments from the file (every field after "# ARGS:")
+    arguments = []
+    for line in source.decode("utf-8").splitlines():
+        if line.startswith("# ARGS:"):
+            arguments.extend(line.split()[2:])
 
-    raw_arguments = arg_extraction.stdout.strip().replace("\n", " ")
-    arguments = raw_arguments.split(" ") if raw_arguments else []
+    # Rebuilding rust_bril changes its mtime, which invalidates every cached compilation
+    binary_stamp = str(RUST_BRIL.stat().st_mtime_ns).encode()
 
     compiled_code = []
     compiled_flags = []
     for name, flags in compilation_flags.items():
-        compile_process = subprocess.run(
-            ["./target/release/rust_bril", "--log-level=off"] + flags + [f.as_posix()],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        command = [RUST_BRIL.as_posix(), "--log-level=off"] + flags + [f.as_posix()]
+
+        flagset_digest = hashlib.sha256(binary_stamp + repr(command[:-1]).encode()).hexdigest()
+        cache_path = COMPILE_CACHE_DIR / flagset_digest / f"{source_digest}.json"
+
+        if cache_path.exists():
+            compiled_code.append(cache_path.read_text(encoding="utf-8"))
+        else:
+            compile_process = subprocess.run(
+                command,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write beside the entry and rename it into place, so an interrupted run or a concurrent
+            # worker never sees a truncated cache file
+            with tempfile.NamedTemporaryFile(
+                mode="w", encoding="utf-8", dir=cache_path.parent, suffix=".tmp", delete=False
+            ) as cache_file:
+                try:
+                    cache_file.write(compile_process.stdout)
+                except BaseException:
+                    os.unlink(cache_file.name)
+                    raise
+            os.replace(cache_file.name, cache_path)
+            compiled_code.append(compile_process.stdout)
 
-        compiled_code.append(compile_process.stdout)
         compiled_flags.append((name, flags))
 
     return BrilBenchmarkInstance(
-        filename=f.as_posix(),
+        filename=filename,
         arguments=arguments,
         compiled_code=compiled_code,
         compiled_flags=compiled_flags,
     )
 
 
-def run_benchmark(bm: BrilBenchmarkInstance, runs: int = 500):
-    """Run benchmark for a given BrilBenchmarkInstance using hyperfine with stability improvements"""
-    import tempfile
-    import os
-    import psutil
+async def count_dyn_instructions(arguments: list[str], code_filename: str) -> int:
+    """Count the dynamic instructions executed by a compiled program using brilirs -p"""
+    dyn_inst_cmd = ["brilirs", "-p", *arguments]
+    with open(code_filename, "rb") as code_file:
+        dyn_inst_proc = await asyncio.create_subprocess_exec(
+            *dyn_inst_cmd,
+            stdin=code_file,
+            stdout=subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await dyn_inst_proc.communicate()
+    if dyn_inst_proc.returncode != 0:
+        raise subprocess.CalledProcessError(dyn_inst_proc.returncode, dyn_inst_cmd, stderr=stderr)
 
+    return int(stderr.decode().strip().split(":")[-1])
+
+
+async def run_benchmark_async(bm: BrilBenchmarkInstance, runs: int = 500):
+    """Run benchmark for a given BrilBenchmarkInstance using hyperfine with stability improvements"""
     try:
         current_process = psutil.Process()
         current_process.nice(-19)
@@ -80,119 +134,157 @@ def run_benchmark(bm: BrilBenchmarkInstance, runs: int = 500):
         pass
 
     results = []
+    json_temp_filenames = []
 
-    for i, (code, flags) in enumerate(zip(bm.compiled_code, bm.compiled_flags)):
-        # Create temporary file for the compiled code
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".bril", delete=False) as temp_file:
-            temp_file.write(code)
-            temp_filename = temp_file.name
+    try:
+        # Write every configuration up front so the profiling runs can be submitted as one batch; the files
+        # are created inside the try so a failed write still cleans up the ones already on disk
+        for code in bm.compiled_code:
+            # Write JSON code directly to temp file (code is already in JSON format from rust_bril)
+            with tempfile.NamedTemporaryFile(mode="w", suffix=".json", dir=TEMP_DIR, delete=False) as json_temp_file:
+                json_temp_filenames.append(json_temp_file.name)
+                json_temp_file.write(code)
+
+        # Dynamic instruction counts are deterministic, so every configuration is profiled concurrently
+        dyn_instr_counts = await asyncio.gather(
+            *(count_dyn_instructions(bm.arguments, filename) for filename in json_temp_filenames)
+        )
+
+        # Everything but the per-configuration files and name is shared by all hyperfine runs
+        hyperfine_prefix = (*_HYPERFINE_BASE, "--max-runs", str(runs * 2))  # Allow up to 2x runs for stability
+
+        # Build the command - brilirs reads JSON from stdin, which hyperfine wires up via --input
+        command = " ".join(["brilirs", *bm.arguments])
+
+        # Timing runs stay sequential so configurations never compete for the core being measured
+        for json_temp_filename, dyn_instr_count, flags in zip(
+            json_temp_filenames, dyn_instr_counts, bm.compiled_flags
+        ):
+            # hyperfine creates its JSON export itself; the program's temp name already makes the path unique
+            json_filename = f"{json_temp_filename}.hyperfine.json"
+
+            # Build hyperfine command
+            flag_name = flags[0]
+
+            hyperfine_cmd = [
+                *hyperfine_prefix,
+                "--input",
+                json_temp_filename,
+                "--export-json",
+                json_filename,
+                "--command-name",
+                flag_name,
+                command,
+            ]
+
+            try:
+                # Run hyperfine
+                hyperfine_proc = await asyncio.create_subprocess_exec(
+                    *hyperfine_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+                if await hyperfine_proc.wait() != 0:
+                    raise subprocess.CalledProcessError(hyperfine_proc.returncode, hyperfine_cmd)
+
+            except subprocess.CalledProcessError as e:
+                # If hyperfine fails, let's see what went wrong
+                print(f"Hyperfine failed for {flag_name}: {e}")
+                print(f"Command: {' '.join(hyperfine_cmd)}")
+                Path(json_filename).unlink(missing_ok=True)
+                # Skip this configuration and continue
+                continue
+
+            try:  # Read and parse hyperfine results
+                with open(json_filename, "rb") as f:
+                    hyperfine_data = orjson.loads(f.read())
+
+                # Extract the benchmark result (hyperfine returns array with one result)
+                bench_result = hyperfine_data["results"][0]
+
+                # Statistical validation and outlier filtering
+                # (kept unboxed until the final dump; float32 keeps ~7 significant digits, far below
+                # timer resolution, and serializes to roughly half the JSON of float64)
+                raw_times = np.asarray(bench_result.get("times", []), dtype=np.float32)
+
+                # Calculate coefficient of variation for stability assessment
+                cv = bench_result["stddev"] / bench_result["mean"] if bench_result["mean"] > 0 else float("inf")
+
+                # Convert hyperfine data to our format with stability metrics
+                result = {
+                    "run_name": flag_name,
+                    "flags": flags[1],
+                    "runs": runs,
+                    "dyn_instr_count": dyn_instr_count,
+                    "avg_time": bench_result["mean"],
+                    "std_dev": bench_result["stddev"],
+                    "min_time": bench_result["min"],
+                    "max_time": bench_result["max"],
+                    "median_time": bench_result["median"],
+                    "coefficient_of_variation": cv,
+                    "stability_rating": "good" if cv < 0.05 else "fair" if cv < 0.15 else "poor",
+                    "times": raw_times,
+                }
+
+                # Report stability
+                if cv > 0.15:
+                    print(f"    ⚠️  High variance for {flag_name}: CV={cv:.3f}")
+
+                results.append(result)
+
+            finally:
+                os.unlink(json_filename)
+
+    finally:
+        # Clean up temporary files
+        for filename in json_temp_filenames:
+            os.unlink(filename)
+
+    return {
+        "filename": bm.filename,
+        "results": results,
+    }
 
-        # Create temporary JSON file for hyperfine output
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as json_file:
-            json_filename = json_file.name
 
-        # Build hyperfine command
-        flag_name = flags[0]
+def run_benchmark(bm: BrilBenchmarkInstance, runs: int = 500):
+    """Process pool entry point for run_benchmark_async"""
+    return asyncio.run(run_benchmark_async(bm, runs))
 
-        # Write JSON code directly to temp file (code is already in JSON format from rust_bril)
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as json_temp_file:
-            json_temp_file.write(code)
-            json_temp_filename = json_temp_file.name
 
-        # Build the command - brilirs reads JSON
-        if bm.arguments:
-            command = f"brilirs {' '.join(bm.arguments)} < {json_temp_filename}"
-        else:
-            command = f"brilirs < {json_temp_filename}"
-
-        # Build the command as a single string for shell=True
-        dyn_inst_command = f"brilirs -p {' '.join(bm.arguments)} < {json_temp_filename}"
-        dyn_inst_proc = subprocess.run(
-            dyn_inst_command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        dyn_inst_output = dyn_inst_proc.stderr.strip()
-
-        # Enhanced hyperfine command with stability options
-        hyperfine_cmd = [
-            "hyperfine",
-            "--show-output",
-            "--warmup",
-            "10",  # 10 warmup runs to stabilize performance
-            "--min-runs",
-            "20",  # Minimum 20 runs even if variance is low
-            "--max-runs",
-            str(runs * 2),  # Allow up to 2x runs if needed for stability
-            "--export-json",
-            json_filename,
-            "--command-name",
-            flag_name,
-            command,
-        ]
+def physical_core_cpus() -> list[list[int]]:
+    """Group the logical CPUs this process may run on by physical core, one list of SMT siblings per core"""
+    if not hasattr(os, "sched_getaffinity"):
+        # Neither CPU affinity nor the sysfs topology exist on macOS; only the core count is used there
+        return [[core] for core in range(psutil.cpu_count(logical=False) or os.cpu_count() or 1)]
 
+    cores: dict[str, list[int]] = {}
+    for cpu in sorted(os.sched_getaffinity(0)):
+        # SMT siblings share one list (e.g. "0,4" or "0-1"), so it identifies the physical core
+        siblings_path = Path(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list")
         try:
-            # Run hyperfine - let's see what the actual error is first
-            result_proc = subprocess.run(
-                hyperfine_cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-            )
+            siblings = siblings_path.read_text().strip()
+        except OSError:
+            siblings = str(cpu)
+        cores.setdefault(siblings, []).append(cpu)
+    return list(cores.values())
 
-        except subprocess.CalledProcessError as e:
-            # If hyperfine fails, let's see what went wrong
-            print(f"Hyperfine failed for {flag_name}: {e}")
-            print(f"Command: {' '.join(hyperfine_cmd)}")
-            if e.stderr:
-                print(f"Error output: {e.stderr}")
-            # Skip this configuration and continue
-            continue
-
-        try:  # Read and parse hyperfine results
-            with open(json_filename, "r") as f:
-                hyperfine_data = json.load(f)
-
-            # Extract the benchmark result (hyperfine returns array with one result)
-            bench_result = hyperfine_data["results"][0]
-
-            # Statistical validation and outlier filtering
-            raw_times = bench_result.get("times", [])
-
-            # Calculate coefficient of variation for stability assessment
-            cv = bench_result["stddev"] / bench_result["mean"] if bench_result["mean"] > 0 else float("inf")
-
-            # Convert hyperfine data to our format with stability metrics
-            result = {
-                "run_name": flag_name,
-                "flags": flags[1],
-                "runs": runs,
-                "dyn_instr_count": int(dyn_inst_output.strip().split(":")[-1]),
-                "avg_time": bench_result["mean"],
-                "std_dev": bench_result["stddev"],
-                "min_time": bench_result["min"],
-                "max_time": bench_result["max"],
-                "median_time": bench_result["median"],
-                "coefficient_of_variation": cv,
-                "stability_rating": "good" if cv < 0.05 else "fair" if cv < 0.15 else "poor",
-                "times": raw_times,
-            }
-
-            # Report stability
-            if cv > 0.15:
-                print(f"    ⚠️  High variance for {flag_name}: CV={cv:.3f}")
-
-            results.append(result)
-
-        finally:
-            # Clean up temporary files
-            os.unlink(temp_filename)
-            os.unlink(json_temp_filename)
-            os.unlink(json_filename)
 
-    return {
-        "filename": bm.filename,
-        "results": results,
-    }
+def pin_benchmark_worker(next_slot, benchmark_cpus: list[int]):
+    """Pin a benchmark worker (and the hyperfine runs it spawns) to a core no other worker uses"""
+    if not hasattr(os, "sched_setaffinity"):
+        # CPU affinity is not exposed on macOS
+        return
+
+    with next_slot.get_lock():
+        slot = next_slot.value
+        next_slot.value += 1
+
+    # benchmark_cpus holds one logical CPU per physical core, so workers never share a core via SMT
+    os.sched_setaffinity(0, {benchmark_cpus[slot % len(benchmark_cpus)]})
+
+
+def pin_compile_worker(compile_cpus: list[int]):
+    """Keep a compile worker off the physical cores that are being timed"""
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, compile_cpus)
 
 
 def check_system_stability():
@@ -229,21 +321,47 @@ def main():
 
     # Collect all .bril files
     bril_files = list(BENCHMARKS_DIR.glob("**/*.bril"))
-    cores = 4  # Reduced for stability
+    core_cpus = physical_core_cpus()
+    # Only use half the physical cores so each hyperfine run has a core to itself, and keep at least one
+    # core back for compilation. Each benchmark worker gets the first logical CPU of its core; the SMT
+    # siblings stay idle so nothing shares the core with the timed run
+    cores = max(1, min(max(2, len(core_cpus) // 2), len(core_cpus) - 1))
+    benchmark_cpus = [cpus[0] for cpus in core_cpus[:cores]]
+    # With a single core there is nothing to keep apart, so compilation may use every CPU
+    compile_cpus = [cpu for cpus in core_cpus[cores:] for cpu in cpus] or [cpu for cpus in core_cpus for cpu in cpus]
 
     print(f"\n🚀 Found {len(bril_files)} .bril files to process")
-    print(f"Using {cores} processes for parallel execution (reduced for benchmark stability)")
+    print(f"Using {cores} processes pinned to separate physical cores for benchmarking (reduced for stability)")
+
+    # Each compiled instance goes to the benchmark pool as soon as it is ready, so benchmarking starts
+    # while the rest of the corpus is still compiling. The compile pool stays small and is pinned to the
+    # cores no benchmark worker uses, so it cannot steal cycles from the timed runs; workers receive
+    # plain path strings to keep pickling cheap.
+    compile_workers = 2
+    bril_filenames = [f.as_posix() for f in bril_files]
+    next_slot = multiprocessing.Value("i", 0)
+    with ProcessPoolExecutor(
+        max_workers=compile_workers, initializer=pin_compile_worker, initargs=(compile_cpus,)
+    ) as compile_pool, ProcessPoolExecutor(
+        max_workers=cores, initializer=pin_benchmark_worker, initargs=(next_slot, benchmark_cpus)
+    ) as bench_pool:
+        compile_futures = [compile_pool.submit(generate_benchmark_instance, f) for f in bril_filenames]
+        bench_futures = [
+            bench_pool.submit(run_benchmark, future.result())
+            for future in tqdm(as_completed(compile_futures), total=len(compile_futures), desc="Processing files")
+        ]
+        benchmarks = [
+            future.result()
+            for future in tqdm(as_completed(bench_futures), total=len(bench_futures), desc="Running benchmarks")
+        ]
 
-    with multiprocessing.Pool(processes=cores) as pool:
-        result = list(
-            tqdm(pool.imap(generate_benchmark_instance, bril_files), total=len(bril_files), desc="Processing files")
-        )
-    with multiprocessing.Pool(processes=cores) as pool2:
-        benchmarks = list(tqdm(pool2.imap(run_benchmark, result), total=len(result), desc="Running benchmarks"))
+    # Benchmarks finish in completion order; sort them so reruns produce the same file
+    benchmarks.sort(key=lambda benchmark: benchmark["filename"])
 
-    # write benchmarks to json file
-    with open("./report/lesson8_benchmark_results.json", "w", encoding="utf-8") as outfile:
-        json.dump(benchmarks, outfile, indent=4)
+    # write benchmarks to json file (numpy arrays are serialized as plain lists)
+    Path("./report/lesson8_benchmark_results.json").write_bytes(
+        orjson.dumps(benchmarks, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    )
 
 
 if __name__ == "__main__":
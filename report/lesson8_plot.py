@@ -8,38 +8,45 @@ This script creates comprehensive visualizations of compilation optimization per
 3. Speedup heatmap (using "ssa" as baseline)
 4. Standard deviation comparison across compilation flags
 
+Pass --bootstrap to pip install any missing required packages first.
+
 Author: GitHub Copilot
 Created: October 26, 2025
 """
 
-import json
+import importlib.util
+import mmap
 import subprocess
 import sys
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
 import warnings
 
 warnings.filterwarnings("ignore")
 
-# Install required packages if not available
-required_packages = ["numpy", "pandas", "matplotlib", "seaborn"]
-missing_packages = []
+# Install required packages if not available. Only probed with --bootstrap, since the imports below
+# already fail with a clear ImportError and eagerly importing every package here is slow.
+required_packages = ["numpy", "pandas", "matplotlib", "seaborn", "orjson", "pyarrow"]
 
-for package in required_packages:
-    try:
-        __import__(package)
-    except ImportError:
-        missing_packages.append(package)
+if "--bootstrap" in sys.argv:
+    missing_packages = [package for package in required_packages if importlib.util.find_spec(package) is None]
 
-if missing_packages:
-    print(f"Installing missing packages: {', '.join(missing_packages)}")
-    subprocess.check_call([sys.executable, "-m", "pip", "install"] + missing_packages)
+    if missing_packages:
+        print(f"Installing missing packages: {', '.join(missing_packages)}")
+        subprocess.check_call([sys.executable, "-m", "pip", "install"] + missing_packages)
 
 # Now import after installation
+import orjson
 import numpy as np
 import pandas as pd
+import matplotlib
+
+# Agg is process-safe, so the figures can be rendered by worker processes
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import matplotlib.colors as colors
+import matplotlib.ticker as ticker
 import seaborn as sns
 from matplotlib.figure import Figure
 
@@ -65,18 +72,51 @@ plt.rcParams.update(
 )
 
 
+# Consistent column order for every plot and summary
+RUN_ORDER = ["original", "ssa", "loop", "lvn & dce", "all"]
+
+# Ordered categorical that keeps every pivot and groupby over run_name in RUN_ORDER
+RUN_NAME_DTYPE = pd.CategoricalDtype(RUN_ORDER, ordered=True)
+
+# Heatmaps show at most this many rows; the remaining benchmarks are averaged into the last one. Well above
+# the current corpus (~120 benchmarks), so today's plots stay per-benchmark and only much larger corpora collapse
+MAX_HEATMAP_ROWS = 1000
+
+# Bump whenever extract_benchmark_metrics changes its output, so older Parquet caches are not reused
+METRICS_CACHE_VERSION = 2
+
+
 def load_benchmark_data(json_path: Any) -> List[Dict[str, Any]]:
     """Load benchmark results from JSON file."""
-    with open(json_path, "r") as f:
-        return json.load(f)
+    # orjson parses straight from a memoryview of the mapped file, so the results are never copied into a bytes object
+    with open(json_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+        return orjson.loads(view)
 
 
-def get_consistent_sort_order(df: pd.DataFrame) -> List[str]:
+def pivot_metric(df_clean: pd.DataFrame, values: str) -> pd.DataFrame:
+    """Pivot one metric into a benchmark (rows) by configuration (columns) grid."""
+    # run_name is an ordered categorical, so the pivot's columns already come out in RUN_ORDER
+    return df_clean.pivot(index="filename", columns="run_name", values=values)
+
+
+def get_consistent_sort_order(instr_pivot: pd.DataFrame) -> List[str]:
     """Get consistent sorting order based on dynamic instruction count from SSA."""
-    df_clean = df.drop_duplicates(subset=["filename", "run_name"])
-    instr_pivot = df_clean.pivot(index="filename", columns="run_name", values="dyn_instruction_count")
-    sort_column = "ssa" if "ssa" in instr_pivot.columns else instr_pivot.columns[0]
-    return instr_pivot.sort_values(by=sort_column, ascending=False).index.tolist()
+    sort_column = instr_pivot["ssa"] if "ssa" in instr_pivot.columns else instr_pivot.iloc[:, 0]
+    # Argsort the negated column directly instead of materializing a sorted DataFrame; NaN sorts last
+    # and the stable sort keeps ties in their original order
+    order = np.argsort(-sort_column.to_numpy(dtype=np.float64), kind="stable")
+    return instr_pivot.index.to_numpy()[order].tolist()
+
+
+def collapse_tail_rows(pivot_df: pd.DataFrame, max_rows: int = MAX_HEATMAP_ROWS) -> pd.DataFrame:
+    """Keep the first max_rows - 1 rows of a sorted pivot and fold the rest into one mean row."""
+    if len(pivot_df) <= max_rows:
+        return pivot_df
+
+    head = pivot_df.iloc[: max_rows - 1]
+    tail = pivot_df.iloc[max_rows - 1 :]
+    others = tail.mean(axis=0).to_frame(f"(others, n={len(tail)})").T
+    return pd.concat([head, others])
 
 
 def extract_benchmark_metrics(data: List[Dict[str, Any]]) -> pd.DataFrame:
@@ -90,144 +130,162 @@ def extract_benchmark_metrics(data: List[Dict[str, Any]]) -> pd.DataFrame:
     - avg_time: average execution time
     - std_dev: standard deviation of execution time
     """
-    records = []
-
-    for benchmark in data:
-        filename = Path(benchmark["filename"]).stem  # Get just the filename without extension/path
-
-        for result in benchmark["results"]:
-            records.append(
-                {
-                    "filename": filename,
-                    "run_name": result["run_name"],
-                    "dyn_instruction_count": result["dyn_instr_count"],
-                    "avg_time": result["avg_time"],
-                    "std_dev": result["std_dev"],
-                }
-            )
-
-    return pd.DataFrame(records)
-
+    # Flatten benchmark -> results in pandas instead of a Python-level double loop
+    df = pd.json_normalize(data, record_path="results", meta=["filename"])
+
+    # Get just the filename without extension/path, using pandas string kernels instead of Path per row.
+    # rpartition yields fixed string columns rather than a list per row; names without a "." keep
+    # their whole basename, like Path.stem
+    basename = df["filename"].str.rpartition("/")[2]
+    parts = basename.str.rpartition(".")
+    df["filename"] = parts[0].where(parts[1] != "", basename)
+
+    df = df.rename(columns={"dyn_instr_count": "dyn_instruction_count"})
+
+    # Both keys come from small fixed sets, so integer category codes make pivots and groupbys cheaper
+    df["run_name"] = df["run_name"].astype(RUN_NAME_DTYPE)
+    df["filename"] = df["filename"].astype("category")
+    return df[["filename", "run_name", "dyn_instruction_count", "avg_time", "std_dev"]]
+
+
+def format_power_of_ten(exponent: float, _position: Any) -> str:
+    """Label a log10 colorbar tick as a power of ten, keeping the fraction for ticks between whole decades."""
+    if np.isclose(exponent, round(exponent)):
+        return f"$10^{{{round(exponent)}}}$"
+    return f"$10^{{{exponent:.3g}}}$"
+
+
+def draw_annotated_heatmap(
+    fig: Figure,
+    ax: Any,
+    pivot_df: pd.DataFrame,
+    cmap: str,
+    norm: colors.Normalize,
+    fmt: str,
+    cbar_label: str,
+    log_values: Optional[np.ndarray] = None,
+) -> None:
+    """
+    Draw a pivot as a single imshow image with one text annotation per non-NaN cell.
 
-def create_instruction_count_comparison(df: pd.DataFrame) -> Figure:
-    """Create dynamic instruction count comparison as a heatmap grid."""
-    fig, ax = plt.subplots(figsize=(12, 20))  # Further increased height for better visibility
+    When precomputed log10 values are given they are colored with the (linear) norm instead of the raw
+    values, and the colorbar is labelled in powers of ten.
+    """
+    values = pivot_df.to_numpy(dtype=np.float64)
+    masked_values = np.ma.masked_invalid(values if log_values is None else log_values)
 
-    # Remove duplicates by taking the first occurrence of each filename+run_name combination
-    df_clean = df.drop_duplicates(subset=["filename", "run_name"])
+    image = ax.imshow(masked_values, cmap=cmap, norm=norm, aspect="auto", interpolation="nearest")
+    if log_values is None:
+        fig.colorbar(image, ax=ax, label=cbar_label)
+    else:
+        fig.colorbar(
+            image,
+            ax=ax,
+            label=cbar_label,
+            # Whole decades when at least two fall inside the range, finer steps for ranges within one decade
+            ticks=ticker.MaxNLocator(integer=True, min_n_ticks=2),
+            format=ticker.FuncFormatter(format_power_of_ten),
+        )
 
-    # Pivot data for easier plotting
-    pivot_df = df_clean.pivot(index="filename", columns="run_name", values="dyn_instruction_count")
+    ax.set_xticks(np.arange(values.shape[1]), labels=pivot_df.columns)
+    ax.set_yticks(np.arange(values.shape[0]), labels=pivot_df.index, rotation=0)
+    ax.grid(False)
+
+    # Pick black or white text from each cell's relative luminance (same rule as seaborn)
+    rgb = image.cmap(image.norm(masked_values))[..., :3]
+    rgb = np.where(rgb <= 0.03928, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    dark_cells = rgb @ np.array([0.2126, 0.7152, 0.0722]) < 0.408
+
+    for (row, col), value in np.ndenumerate(values):
+        if np.isnan(value):
+            continue
+        ax.text(
+            col,
+            row,
+            format(value, fmt),
+            ha="center",
+            va="center",
+            color="white" if dark_cells[row, col] else "black",
+        )
 
-    # Ensure consistent column order
-    run_order = ["original", "ssa", "loop", "lvn & dce", "all"]
-    pivot_df = pivot_df.reindex(columns=run_order)
 
-    # Use consistent sorting order
-    sort_order = get_consistent_sort_order(df)
-    pivot_df = pivot_df.reindex(sort_order)
+def create_instruction_count_comparison(pivot_df: pd.DataFrame, log_values: np.ndarray) -> Figure:
+    """Create dynamic instruction count comparison as a heatmap grid from the sorted instruction pivot and its log10."""
+    fig, ax = plt.subplots(figsize=(12, 20), constrained_layout=True)  # Further increased height for better visibility
 
     # Create heatmap with log scale
-    sns.heatmap(
+    draw_annotated_heatmap(
+        fig,
+        ax,
         pivot_df,
-        annot=True,
-        fmt=".0f",
         cmap="viridis",
-        norm=colors.LogNorm(),  # Log scale for colors
-        cbar_kws={"label": "Dynamic Instruction Count (log scale)"},
-        ax=ax,
+        norm=colors.Normalize(),  # Log scale for colors, already applied to log_values
+        fmt=".0f",
+        cbar_label="Dynamic Instruction Count (log scale)",
+        log_values=log_values,
     )
 
     ax.set_title("Dynamic Instruction Count Comparison Across Compilation Flags\n(Sorted by instruction count)")
     ax.set_xlabel("Compilation Configuration")
     ax.set_ylabel("Benchmark Programs")
 
-    # Rotate y-axis labels for better readability
-    ax.set_yticklabels(ax.get_yticklabels(), rotation=0)
-
-    plt.tight_layout()
     return fig
 
 
-def create_execution_time_comparison(df: pd.DataFrame) -> Figure:
-    """Create execution time comparison as a heatmap grid."""
-    fig, ax = plt.subplots(figsize=(12, 20))  # Further increased height for better visibility
-
-    # Remove duplicates by taking the first occurrence of each filename+run_name combination
-    df_clean = df.drop_duplicates(subset=["filename", "run_name"])
-
-    # Pivot data for easier plotting
-    pivot_df = df_clean.pivot(index="filename", columns="run_name", values="avg_time")
-
-    # Ensure consistent column order
-    run_order = ["original", "ssa", "loop", "lvn & dce", "all"]
-    pivot_df = pivot_df.reindex(columns=run_order)
-
-    # Use consistent sorting order
-    sort_order = get_consistent_sort_order(df)
-    pivot_df = pivot_df.reindex(sort_order)
+def create_execution_time_comparison(pivot_df: pd.DataFrame, log_values: np.ndarray) -> Figure:
+    """Create execution time comparison as a heatmap grid from the sorted execution time pivot and log10 of it in ms."""
+    fig, ax = plt.subplots(figsize=(12, 20), constrained_layout=True)  # Further increased height for better visibility
 
     # Convert to milliseconds for better readability
     pivot_df = pivot_df * 1000
 
     # Create heatmap with log scale
-    sns.heatmap(
+    draw_annotated_heatmap(
+        fig,
+        ax,
         pivot_df,
-        annot=True,
-        fmt=".2f",
         cmap="plasma",
-        norm=colors.LogNorm(),  # Log scale for colors
-        cbar_kws={"label": "Average Execution Time (ms, log scale)"},
-        ax=ax,
+        norm=colors.Normalize(),  # Log scale for colors, already applied to log_values
+        fmt=".2f",
+        cbar_label="Average Execution Time (ms, log scale)",
+        log_values=log_values,
     )
 
     ax.set_title("Execution Time Comparison Across Compilation Flags\n(Sorted by instruction count)")
     ax.set_xlabel("Compilation Configuration")
     ax.set_ylabel("Benchmark Programs")
 
-    # Rotate y-axis labels for better readability
-    ax.set_yticklabels(ax.get_yticklabels(), rotation=0)
-
-    plt.tight_layout()
     return fig
 
 
-def create_speedup_heatmap(df: pd.DataFrame) -> Figure:
-    """Create speedup heatmap using 'ssa' as baseline (1x multiple)."""
-    fig, ax = plt.subplots(figsize=(12, 20))  # Further increased height for better visibility
-
-    # Remove duplicates by taking the first occurrence of each filename+run_name combination
-    df_clean = df.drop_duplicates(subset=["filename", "run_name"])
-
-    # Pivot data for easier manipulation
-    pivot_df = df_clean.pivot(index="filename", columns="run_name", values="avg_time")
+def compute_speedup(time_pivot: pd.DataFrame) -> pd.DataFrame:
+    """Divide each benchmark's execution times by its 'ssa' time (baseline = 1x multiple)."""
+    if "ssa" in time_pivot.columns:
+        baseline_column = time_pivot.columns.get_loc("ssa")
+    else:
+        print("Warning: 'ssa' column not found, using first column as baseline")
+        baseline_column = 0
 
-    # Ensure consistent column order
-    run_order = ["original", "ssa", "loop", "lvn & dce", "all"]
-    pivot_df = pivot_df.reindex(columns=run_order)
+    # Broadcast one reciprocal per row over the raw ndarray, skipping pandas' per-column alignment
+    times = time_pivot.to_numpy(dtype=np.float64)
+    return pd.DataFrame(
+        times * (1.0 / times[:, baseline_column])[:, np.newaxis], index=time_pivot.index, columns=time_pivot.columns
+    )
 
-    # Use consistent sorting order
-    sort_order = get_consistent_sort_order(df)
-    pivot_df = pivot_df.reindex(sort_order)
 
-    # Calculate speedup relative to 'ssa' (baseline = 1x)
-    if "ssa" in pivot_df.columns:
-        speedup_df = pivot_df.div(pivot_df["ssa"], axis=0)
-    else:
-        print("Warning: 'ssa' column not found, using first column as baseline")
-        speedup_df = pivot_df.div(pivot_df.iloc[:, 0], axis=0)
+def create_speedup_heatmap(speedup_df: pd.DataFrame) -> Figure:
+    """Create speedup heatmap using 'ssa' as baseline (1x multiple) from the sorted per-benchmark speedups."""
+    fig, ax = plt.subplots(figsize=(12, 20), constrained_layout=True)  # Further increased height for better visibility
 
-    # Create heatmap
-    mask = speedup_df.isna()
-    sns.heatmap(
+    # Create heatmap (NaN cells are left blank)
+    draw_annotated_heatmap(
+        fig,
+        ax,
         speedup_df,
-        annot=True,
-        fmt=".2f",
         cmap="RdYlGn_r",  # Red for slower, Green for faster
-        center=1.0,  # Center colormap at 1x (no speedup/slowdown)
-        cbar_kws={"label": "Execution Time Multiple (relative to SSA)"},
-        mask=mask,
-        ax=ax,
+        norm=colors.CenteredNorm(vcenter=1.0),  # Center colormap at 1x (no speedup/slowdown)
+        fmt=".2f",
+        cbar_label="Execution Time Multiple (relative to SSA)",
     )
 
     ax.set_title(
@@ -236,55 +294,56 @@ def create_speedup_heatmap(df: pd.DataFrame) -> Figure:
     ax.set_xlabel("Compilation Configuration")
     ax.set_ylabel("Benchmark Programs")
 
-    # Rotate y-axis labels for better readability
-    ax.set_yticklabels(ax.get_yticklabels(), rotation=0)
-
-    plt.tight_layout()
     return fig
 
 
-def create_stddev_comparison(df: pd.DataFrame) -> Figure:
+def create_stddev_comparison(df_clean: pd.DataFrame) -> Figure:
     """Create standard deviation comparison as a bar plot of averages for each optimization type."""
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = plt.subplots(figsize=(10, 6), constrained_layout=True)
 
-    # Remove duplicates by taking the first occurrence of each filename+run_name combination
-    df_clean = df.drop_duplicates(subset=["filename", "run_name"])
-
-    # Calculate average standard deviation for each optimization type
-    avg_stddev = df_clean.groupby("run_name")["std_dev"].mean()
-
-    # Ensure consistent column order
-    run_order = ["original", "ssa", "loop", "lvn & dce", "all"]
-    avg_stddev = avg_stddev.reindex(run_order)
+    # Calculate average standard deviation for each optimization type; grouping over every category
+    # yields all of RUN_ORDER in order, with NaN for configurations without data
+    avg_stddev = df_clean.groupby("run_name", observed=False)["std_dev"].mean()
 
     # Convert to milliseconds for better readability
     avg_stddev = avg_stddev * 1000
 
+    # Drop configurations without data up front so they get neither a bar nor a label;
+    # each configuration keeps its own palette color
+    present = avg_stddev.notna().to_numpy()
+    colors = [color for color, keep in zip(sns.color_palette("husl", len(RUN_ORDER)), present) if keep]
+    valid = avg_stddev[present]
+
     # Create bar plot
-    colors = sns.color_palette("husl", len(run_order))
-    bars = ax.bar(run_order, avg_stddev, color=colors, alpha=0.8, edgecolor='black', linewidth=0.5)
+    bars = ax.bar(valid.index, valid.to_numpy(), color=colors, alpha=0.8, edgecolor='black', linewidth=0.5)
 
     # Add value labels on top of bars
-    for bar, value in zip(bars, avg_stddev):
-        if not pd.isna(value):
-            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.001, 
-                   f'{value:.3f}', ha='center', va='bottom', fontweight='bold')
+    for bar, value in zip(bars, valid.to_numpy()):
+        ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.001, 
+               f'{value:.3f}', ha='center', va='bottom', fontweight='bold')
 
     ax.set_title("Average Execution Time Variability by Optimization Type")
     ax.set_xlabel("Compilation Configuration")
     ax.set_ylabel("Average Standard Deviation (ms)")
     ax.grid(True, alpha=0.3, axis='y')
 
-    plt.tight_layout()
     return fig
 
 
+def render_plot(plot_function: Callable[..., Figure], plot_args: tuple, output_path: Path, dpi: Any) -> None:
+    """Create one figure and save it (dpi=None uses savefig.dpi); runs in a worker process."""
+    fig = plot_function(*plot_args)
+    # matplotlib hands PNG encoding to Pillow; zlib level 1 costs a fraction of the default level 6
+    fig.savefig(output_path, dpi=dpi, pil_kwargs={"compress_level": 1})
+    plt.close(fig)
+
+
 def create_summary_statistics_table(df: pd.DataFrame) -> pd.DataFrame:
     """Create a summary statistics table for analysis."""
 
     # Calculate summary statistics for each run configuration
     summary_stats = (
-        df.groupby("run_name")
+        df.groupby("run_name", observed=True)
         .agg(
             {
                 "dyn_instruction_count": ["mean", "std", "min", "max"],
@@ -311,9 +370,22 @@ def main():
         print(f"❌ Error: {data_path} not found!")
         return
 
-    print("📊 Loading benchmark data...")
-    raw_data = load_benchmark_data(data_path)
-    df = extract_benchmark_metrics(raw_data)
+    # Reuse the extracted metrics while they are newer than the results file and have the current schema;
+    # the plots rely on the categorical dtypes for their row/column order, so a cache without them is rebuilt
+    cache_path = Path(f"report/plots/.cache.v{METRICS_CACHE_VERSION}.parquet")
+    df = None
+    if cache_path.exists() and cache_path.stat().st_mtime > data_path.stat().st_mtime:
+        df = pd.read_parquet(cache_path, engine="pyarrow")
+        if df["run_name"].dtype != RUN_NAME_DTYPE or not isinstance(df["filename"].dtype, pd.CategoricalDtype):
+            df = None
+        else:
+            print("📊 Loading cached benchmark metrics...")
+    if df is None:
+        print("📊 Loading benchmark data...")
+        raw_data = load_benchmark_data(data_path)
+        df = extract_benchmark_metrics(raw_data)
+        cache_path.parent.mkdir(exist_ok=True)
+        df.to_parquet(cache_path, engine="pyarrow", compression="zstd")
 
     print(
         f"✅ Loaded data for {len(df['filename'].unique())} benchmarks with {len(df['run_name'].unique())} configurations"
@@ -324,26 +396,64 @@ def main():
     output_dir = Path("report/plots")
     output_dir.mkdir(exist_ok=True)
 
-    # Generate plots
-    print("📈 Generating dynamic instruction count comparison...")
-    fig1 = create_instruction_count_comparison(df)
-    fig1.savefig(output_dir / "1_instruction_count_comparison.png")
-    plt.close(fig1)
-
-    print("⏱️  Generating execution time comparison...")
-    fig2 = create_execution_time_comparison(df)
-    fig2.savefig(output_dir / "2_execution_time_comparison.png")
-    plt.close(fig2)
-
-    print("🔥 Generating speedup heatmap...")
-    fig3 = create_speedup_heatmap(df)
-    fig3.savefig(output_dir / "3_speedup_heatmap.png")
-    plt.close(fig3)
-
-    print("📊 Generating standard deviation comparison...")
-    fig4 = create_stddev_comparison(df)
-    fig4.savefig(output_dir / "4_stddev_comparison.png")
-    plt.close(fig4)
+    # Shared preprocessing for every plot: remove duplicates by taking the first occurrence of each
+    # filename+run_name combination, then pivot once per metric in a consistent row/column order
+    df_clean = df.drop_duplicates(subset=["filename", "run_name"])
+    instr_pivot = pivot_metric(df_clean, "dyn_instruction_count")
+    sort_order = get_consistent_sort_order(instr_pivot)
+    instr_pivot = instr_pivot.reindex(index=sort_order)
+    time_pivot = pivot_metric(df_clean, "avg_time").reindex(index=sort_order)
+
+    # Heatmaps draw one annotated cell per row, so bound their size for large corpora
+    instr_heatmap = collapse_tail_rows(instr_pivot)
+    time_heatmap = collapse_tail_rows(time_pivot)
+    # Speedups are taken per benchmark before collapsing, so a collapsed row averages the ratios
+    # instead of dividing averaged times, which the slowest benchmarks would dominate
+    speedup_heatmap = collapse_tail_rows(compute_speedup(time_pivot))
+
+    # Both log-scaled heatmaps color by log10, computed once here instead of by a LogNorm at render time
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_instr = np.log10(instr_heatmap.to_numpy(dtype=np.float64))
+        log_time = np.log10(time_heatmap.to_numpy(dtype=np.float64) * 1000)
+
+    # Generate plots. Each figure is independent, so they render and encode in separate processes
+    plot_jobs = [
+        (
+            "📈 Generating dynamic instruction count comparison...",
+            create_instruction_count_comparison,
+            (instr_heatmap, log_instr),
+            "1_instruction_count_comparison.png",
+            150,
+        ),
+        (
+            "⏱️  Generating execution time comparison...",
+            create_execution_time_comparison,
+            (time_heatmap, log_time),
+            "2_execution_time_comparison.png",
+            150,
+        ),
+        (
+            "🔥 Generating speedup heatmap...",
+            create_speedup_heatmap,
+            (speedup_heatmap,),
+            "3_speedup_heatmap.png",
+            None,
+        ),
+        (
+            "📊 Generating standard deviation comparison...",
+            create_stddev_comparison,
+            (df_clean,),
+            "4_stddev_comparison.png",
+            None,
+        ),
+    ]
+    with ProcessPoolExecutor(max_workers=len(plot_jobs)) as pool:
+        futures = []
+        for message, plot_function, plot_args, filename, dpi in plot_jobs:
+            print(message)
+            futures.append(pool.submit(render_plot, plot_function, plot_args, output_dir / filename, dpi))
+        for future in futures:
+            future.result()
 
     # Generate summary statistics
     print("📋 Generating summary statistics...")
@@ -360,26 +470,28 @@ def main():
         print(f"   • {filename}")
 
     print(f"\n🔧 Compilation configurations analyzed:")
-    run_order = ["original", "ssa", "loop", "lvn & dce", "all"]
-    for run_name in run_order:
-        if run_name in df["run_name"].unique():
-            count = len(df[df["run_name"] == run_name])
+    # One counting pass instead of a boolean-mask scan of df per configuration
+    run_counts = df["run_name"].value_counts()
+    for run_name in RUN_ORDER:
+        count = int(run_counts.get(run_name, 0))
+        if count:
             print(f"   • {run_name}: {count} benchmarks")
 
     print(f"\n📊 Average metrics across all benchmarks:")
-    avg_metrics = df.groupby("run_name")[["dyn_instruction_count", "avg_time", "std_dev"]].mean()
-    for run_name in run_order:
+    avg_metrics = df.groupby("run_name", observed=True)[["dyn_instruction_count", "avg_time", "std_dev"]].mean()
+    for run_name in RUN_ORDER:
         if run_name in avg_metrics.index:
-            instr = float(avg_metrics.loc[run_name, "dyn_instruction_count"])
-            time_ms = float(avg_metrics.loc[run_name, "avg_time"]) * 1000
-            std_ms = float(avg_metrics.loc[run_name, "std_dev"]) * 1000
+            run_metrics = avg_metrics.loc[run_name]
+            instr = float(run_metrics["dyn_instruction_count"])
+            time_ms = float(run_metrics["avg_time"]) * 1000
+            std_ms = float(run_metrics["std_dev"]) * 1000
             print(f"   • {run_name:12}: {instr:8.0f} instructions, {time_ms:6.2f}ms ±{std_ms:5.2f}ms")
 
     # Calculate speedups relative to SSA
     if "ssa" in avg_metrics.index:
         ssa_time = float(avg_metrics.loc["ssa", "avg_time"])
         print(f"\n🚀 Speedup relative to SSA baseline:")
-        for run_name in run_order:
+        for run_name in RUN_ORDER:
             if run_name in avg_metrics.index and run_name != "ssa":
                 run_time = float(avg_metrics.loc[run_name, "avg_time"])
                 speedup = ssa_time / run_time
@@ -1,6 +1,6 @@
 use clap::{Parser, ValueEnum};
 use log::LevelFilter;
-use rust_bril::{bril_logger, optimizations::dce, optimizations::lvn};
+use rust_bril::{bril_logger, representation::RichAbstractProgram};
 use std::path::Path;
 
 // use rust_bril::{
@@ -31,6 +31,41 @@ enum LogLevel {
     Off,
 }
 
+/// Separates consecutive programs written by `--emit-passes` (ASCII record separator)
+const PIPELINE_SEPARATOR: &str = "\x1e";
+
+#[derive(ValueEnum, Clone, Copy, Debug, PartialEq, Eq)]
+enum Pipeline {
+    /// SSA round trip
+    #[value(name = "ssa")]
+    Ssa,
+    /// SSA + dead code elimination
+    #[value(name = "ssa_dce")]
+    SsaDce,
+    /// SSA + local value numbering + dead code elimination
+    #[value(name = "ssa_lvn_dce")]
+    SsaLvnDce,
+    /// SSA + loop optimizations
+    #[value(name = "ssa_loop")]
+    SsaLoop,
+    /// SSA + local value numbering + dead code elimination + loop optimizations
+    #[value(name = "ssa_lvn_dce_loop")]
+    SsaLvnDceLoop,
+}
+
+impl Pipeline {
+    /// returns which passes to run as (lvn, dce, loops)
+    fn passes(self) -> (bool, bool, bool) {
+        match self {
+            Pipeline::Ssa => (false, false, false),
+            Pipeline::SsaDce => (false, true, false),
+            Pipeline::SsaLvnDce => (true, true, false),
+            Pipeline::SsaLoop => (false, false, true),
+            Pipeline::SsaLvnDceLoop => (true, true, true),
+        }
+    }
+}
+
 // #[derive(ValueEnum, Clone, Debug, PartialEq, Eq)]
 // enum DataflowAnalysis {
 //     /// set of variables that are initialized by the end of each basic block
@@ -73,6 +108,11 @@ struct Args {
     /// Skip SSA
     #[arg(short = 's', action)]
     skip_pass: bool,
+
+    /// Emit one program per pipeline from a single SSA conversion, separated by 0x1e.
+    /// Overrides --dce, --lvn, and --loops; cannot be combined with -s
+    #[arg(long, value_enum, value_delimiter = ',', conflicts_with = "skip_pass")]
+    emit_passes: Vec<Pipeline>,
 }
 
 impl From<LogLevel> for LevelFilter {
@@ -88,6 +128,54 @@ impl From<LogLevel> for LevelFilter {
     }
 }
 
+fn optimize(
+    mut abstract_program: RichAbstractProgram,
+    lvn: bool,
+    dce: bool,
+    loops: bool,
+) -> RichAbstractProgram {
+    if lvn {
+        abstract_program.program.functions = abstract_program
+            .program
+            .functions
+            .into_iter()
+            .map(|(n, af)| match rust_bril::optimizations::lvn(af) {
+                Ok(af_new) => (n, af_new),
+                Err(e) => e.error_with_context_then_exit(&abstract_program.original_text),
+            })
+            .collect();
+    }
+
+    if dce {
+        abstract_program.program.functions = abstract_program
+            .program
+            .functions
+            .into_iter()
+            .map(|(n, af)| match rust_bril::optimizations::dce(af) {
+                Ok(af_new) => (n, af_new),
+                Err(e) => e.error_with_context_then_exit(&abstract_program.original_text),
+            })
+            .collect();
+    }
+
+    // run optimizations
+    if loops {
+        abstract_program.program.functions = abstract_program
+            .program
+            .functions
+            .into_iter()
+            .map(|(n, af)| {
+                match rust_bril::optimizations::loops::loop_invariant_code_motion_pass(af) {
+                    Ok(af_new) => (n, af_new),
+                    Err(e) => e.error_with_context_then_exit(&abstract_program.original_text),
+                }
+            })
+            .collect();
+    }
+
+    abstract_program
+}
+
 fn main() {
     let args = Args::parse();
 
@@ -129,46 +217,38 @@ fn main() {
     }
 
     // convert into SSA form
-    let mut abstract_program = rust_bril::representation::RichAbstractProgram::from(rich_program);
+    let mut abstract_program = RichAbstractProgram::from(rich_program);
 
-    if args.lvn {
-        abstract_program.program.functions = abstract_program
-            .program
-            .functions
-            .into_iter()
-            .map(|(n, af)| match lvn(af) {
-                Ok(af_new) => (n, af_new),
-                Err(e) => e.error_with_context_then_exit(&abstract_program.original_text),
+    if !args.emit_passes.is_empty() {
+        // the expensive parse + SSA conversion is shared, only the passes are rerun
+        let programs: Vec<String> = args
+            .emit_passes
+            .iter()
+            .map(|pipeline| {
+                let (lvn, dce, loops) = pipeline.passes();
+                let optimized = optimize(abstract_program.clone(), lvn, dce, loops);
+                if args.show_ssa {
+                    optimized.into_ssa_program().to_string()
+                } else {
+                    optimized.into_program().to_string()
+                }
             })
             .collect();
-    }
+        let output = programs.join(PIPELINE_SEPARATOR);
 
-    if args.dce {
-        abstract_program.program.functions = abstract_program
-            .program
-            .functions
-            .into_iter()
-            .map(|(n, af)| match dce(af) {
-                Ok(af_new) => (n, af_new),
-                Err(e) => e.error_with_context_then_exit(&abstract_program.original_text),
-            })
-            .collect();
+        if let Some(filepath) = args.output {
+            log::info!("writing programs to file '{}'", filepath);
+            if let Err(e) = std::fs::write(Path::new(&filepath), output) {
+                log::error!("Failed to write programs to file '{}': {}", filepath, e);
+                std::process::exit(1);
+            }
+        } else {
+            println!("{}", output);
+        }
+        return;
     }
 
-    // run optimizations
-    if args.loops {
-        abstract_program.program.functions = abstract_program
-            .program
-            .functions
-            .into_iter()
-            .map(|(n, af)| {
-                match rust_bril::optimizations::loops::loop_invariant_code_motion_pass(af) {
-                    Ok(af_new) => (n, af_new),
-                    Err(e) => e.error_with_context_then_exit(&abstract_program.original_text),
-                }
-            })
-            .collect();
-    }
+    abstract_program = optimize(abstract_program, args.lvn, args.dce, args.loops);
 
     // convert out of SSA form
     let final_program = if args.show_ssa {